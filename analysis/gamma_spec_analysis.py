@@ -7,7 +7,7 @@ import pandas as pd
 
 # from foil_analysis.radionuclide import Radionuclide, RadionuclideList
 from monitor_xs_ip2.target import Target, TargetList
-from monitor_xs_ip2.utils import load_config
+from monitor_xs_ip2.core.utils import load_config, EXCEL_ENGINE
 from monitor_xs_ip2.data_plots import print_test_target_results
 
 # Load configuration file
@@ -15,35 +15,39 @@ config = load_config()
 
 #%% Load data
 
-# Load target data
-df = pd.read_excel(
-    config['IRRADIATIONS'],
-    sheet_name='Irradiations',
-    usecols='A:F,I:K',
-    names=['dt_start','dt_end','target_no','material','mass','thickness','integral','current','degrader'],
-    dtype={'dt_start': str, 'dt_end': str}
-    )
+# Open the workbook once (calamine when installed, much faster than openpyxl)
+# and parse the sheets from the same handle
+with pd.ExcelFile(config['IRRADIATIONS'], engine=EXCEL_ENGINE) as xf:
+    # Load target data: columns A:F and I:K as integer indices
+    df = xf.parse(
+        sheet_name='Irradiations',
+        usecols=[0, 1, 2, 3, 4, 5, 8, 9, 10],
+        header=0,
+        parse_dates=[0, 1]
+        )
+
+# Rename columns after loading
+df.columns = ['dt_start','dt_end','target_no','material','mass','thickness','integral','current','degrader']
+
+# Extract each column once to avoid boxing pandas Series row by row
+cols = {c: df[c].to_numpy() for c in ['mass', 'target_no', 'material', 'thickness', 'degrader', 'current']}
+
+# Datetime columns as objects keep datetime semantics (datetime64 otherwise)
+cols['dt_start'] = df['dt_start'].to_numpy(dtype=object)
+cols['dt_end'] = df['dt_end'].to_numpy(dtype=object)
 
 targets = TargetList(
     [Target(
-        dt_start,
-        dt_end,
-        mass,
-        tar_id,
-        tar_mat,
-        tar_thick,
+        cols['dt_start'][i],
+        cols['dt_end'][i],
+        cols['mass'][i],
+        cols['target_no'][i],
+        cols['material'][i],
+        cols['thickness'][i],
         0, # enrichement, 0 = natural
-        deg,
-        current
-        ) for dt_start, dt_end, mass, tar_id, tar_mat, tar_thick, deg, current in zip(
-            df.dt_start,
-            df.dt_end,
-            df.mass,
-            df.target_no,
-            df.material,
-            df.thickness,
-            df.degrader,
-            df.current)
+        cols['degrader'][i],
+        cols['current'][i]
+        ) for i in range(len(df))
         ]
     )
 
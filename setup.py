@@ -10,7 +10,8 @@ setup(
     author_email='edoardo.renaldin@gmail.com',
     package_dir={"": "src"},
     install_requires=[
-        'pandas',
+        'pandas>=2.0',
+        'python-calamine',
         'scipy',
         'numpy',
         'matplotlib',
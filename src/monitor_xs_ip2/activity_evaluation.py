@@ -20,6 +20,17 @@ uA_TO_A = 10**(-6)
 MBARN_TO_CM2 = 10**(-27)
 uM_TO_CM = 10**(-4)
 
+# Constant part of the EoB activity: (cm^2/mbarn) * (A/uA) * (cm/um) * N_AVO / (Q * Z)
+EOB_CONST = MBARN_TO_CM2 * uA_TO_A * uM_TO_CM * N_AVO / (Q * Z)
+
+#%% Numeric kernel of EoB activity
+
+def _act_eob_kernel(xs, current_uA, density, foil_um, lambda_, t_irr, mol_weight):
+    ''' EoB activity from cross section values (mbarn), current (uA) and foil thickness (um) '''
+    # Scalar factors are combined first, so that array-valued cross sections are multiplied only once
+    factor = EOB_CONST * current_uA * density * foil_um * -np.expm1(-lambda_ * t_irr) / mol_weight
+    return xs * factor
+
 #%% Calculation of activity for thin foils (micrometric thickness)
 
 def evaluate_eob_activity(
@@ -61,15 +72,17 @@ def evaluate_eob_activity(
 
     '''
     
-    # Get interpolation function of cross section data
+    # Get interpolation function of cross section data (cached per nuclide in
+    # cross_section, shared between targets: the interpolators must not be mutated)
     f_xs, f_unc_xs = interpolate_cross_section(nuclide)
     
-    # Convert current from micro-Ampere to Ampere
-    current_conv = current * uA_TO_A
-    
-    # Convert foil thickness from micrometer to centimeter
-    foil_thickness_conv = foil_thickness * uM_TO_CM
-    
-    # Evaluate EoB activity    
-    return f_xs(energy) * MBARN_TO_CM2 * current_conv * N_AVO * density * foil_thickness_conv * (1-np.exp(-lambda_ * t_irr)) / (Q * Z * mol_weight)
-    
\ No newline at end of file
+    # Evaluate EoB activity
+    return _act_eob_kernel(
+        f_xs(energy),
+        current,
+        density,
+        foil_thickness,
+        lambda_,
+        t_irr,
+        mol_weight
+        )
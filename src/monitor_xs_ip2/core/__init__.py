@@ -1,2 +1,2 @@
-from .utils import time_difference, get_lambda_err, load_config
+from .utils import time_difference, time_differences, get_lambda_err, get_lambdas_errs, load_config, load_workbook, cached_by_mtime, IndexedList
 from .srim_utils import Transmit
\ No newline at end of file
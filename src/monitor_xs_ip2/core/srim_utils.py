@@ -11,6 +11,29 @@ from srim import Ion, TRIM, Target
 #%% Custom packages
 
 
+#%% Layout of TRANSMIT.txt file (regular expressions compiled once)
+
+# Example line: ====== TRIM Calc.=  H(10 MeV) ==> Ti_1+Ni_1(  50 um) =========================
+_TRIM_CALC_RE = re.compile(rb'=+\s+TRIM\s+Calc\.=\s+([a-zA-Z]+)\((\d+)\s*([a-zA-Z]+)\)\s+==>\s+(.+?)\s*\(\s+(\d+)\s+([a-zA-Z]+)\)')
+
+# Last header line before the data
+_HEADERS_RE = re.compile(rb'\s*Numb\s+Numb\s+\(eV\)\s+X\(A\)\s+Y\(A\)\s+Z\(A\)\s+Cos\(X\)\s+Cos\(Y\)\s+Cos\(Z\)\s*')
+
+# Columns of the TRANSMIT.txt data table
+_TRANSMIT_COLUMNS = ['particle_type', 'ion_number', 'z_leaving_atom', 'atom_energy', 'depth', 'Y_axis', 'Z_axis', 'cos_x', 'cos_y', 'cos_z']
+_TRANSMIT_DTYPES = {
+    'particle_type': str,
+    'ion_number': 'int64',
+    'z_leaving_atom': 'int64',
+    'atom_energy': 'float64',
+    'depth': 'float64',
+    'Y_axis': 'float64',
+    'Z_axis': 'float64',
+    'cos_x': 'float64',
+    'cos_y': 'float64',
+    'cos_z': 'float64'
+    }
+
 #%% Super class based on initialized Transmit class of PySRIM, but never implemented
 
 class Transmit():
@@ -39,8 +62,7 @@ class Transmit():
     def _read_trim_inputs(self, output):
         ''' Example line to read from the file:
             ====== TRIM Calc.=  H(10 MeV) ==> Ti_1+Ni_1(  50 um) ========================= '''
-        pattern_trim_calc = r'=+\s+TRIM\s+Calc\.=\s+([a-zA-Z]+)\((\d+)\s*([a-zA-Z]+)\)\s+==>\s+(.+?)\s*\(\s+(\d+)\s+([a-zA-Z]+)\)'
-        match = re.search(pattern_trim_calc.encode('utf-8'), output)
+        match = _TRIM_CALC_RE.search(output)
         
         if match:
             out_dict = {
@@ -69,22 +91,19 @@ class Transmit():
          Ion  Atom   Energy        Depth       Lateral-Position        Atom Direction      
          Numb Numb    (eV)          X(A)        Y(A)       Z(A)      Cos(X)  Cos(Y) Cos(Z) '''
         
-        # Last header pattern
-        pattern_headers = r'\s*Numb\s+Numb\s+\(eV\)\s+X\(A\)\s+Y\(A\)\s+Z\(A\)\s+Cos\(X\)\s+Cos\(Y\)\s+Cos\(Z\)\s*'
-        
         # Find location of first data line
-        headers_match = re.search(pattern_headers.encode('utf-8'), output)
+        headers_match = _HEADERS_RE.search(output)
         start_idx = headers_match.end()
         
-        # Extract raw data
-        rawdata = BytesIO(output[start_idx:]).read().decode('utf-8')
-        
-        # Process the data
-        data = [list(re.split(r'\s+', line.strip())) for line in rawdata.split('\r\n') if len(line.strip()) > 0]
-        
-        df_output = pd.DataFrame(
-            data,
-            columns=['particle_type', 'ion_number', 'z_leaving_atom', 'atom_energy', 'depth', 'Y_axis', 'Z_axis', 'cos_x', 'cos_y', 'cos_z']
+        # Parse the data table with the C tokenizer into typed columns
+        df_output = pd.read_csv(
+            BytesIO(output[start_idx:]),
+            sep=r'\s+',
+            header=None,
+            names=_TRANSMIT_COLUMNS,
+            dtype=_TRANSMIT_DTYPES,
+            engine='c',
+            skip_blank_lines=True
             )
         
         return df_output
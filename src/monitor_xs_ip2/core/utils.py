@@ -6,22 +6,58 @@ import os
 from math import log
 from datetime import datetime as dt
 import json
-from typing import Tuple
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, Union
 
 #%% Constants
 
+# Excel reader engine: calamine (Rust-based) when installed, openpyxl otherwise
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+# Natural logarithm of 2
+LN2 = log(2)
+
+# Conversion factors of half-life units of measure to seconds
+_UOM_SECONDS = {
+    's': 1.0,
+    'm': 60.0,
+    'h': 3600.0,
+    'd': 86400.0,
+    'y': 31_536_000.0,
+    }
+
 #%% Time difference function
 
-def time_difference(date_hour_in: str, date_hour_end: str) -> float:
+def _parse_datetime(date_hour: Union[str, dt]) -> dt:
+    ''' Parse a 'yyyy-mm-dd hh:mm:ss[.ffffff]' string (datetimes are returned as they are) '''
+    
+    # Datetimes already parsed by pandas (e.g. parse_dates) are used as they are
+    if isinstance(date_hour, dt):
+        return date_hour
+    
+    # ISO parser implemented in C, no format string needed
+    try:
+        return dt.fromisoformat(date_hour)
+    except ValueError:
+        # Older Python versions only accept 3 or 6 digits of fractional seconds
+        fmt = '%Y-%m-%d %H:%M:%S.%f' if '.' in date_hour else '%Y-%m-%d %H:%M:%S'
+        return dt.strptime(date_hour, fmt)
+
+def time_difference(date_hour_in: Union[str, dt], date_hour_end: Union[str, dt]) -> float:
     '''
     Function that calculates the elapsed time between two dates and respective hours
 
     Parameters
     ----------
-    date_hour_in : string
-        format = 'dd-mm-yy hh:mm:ss'.
-    date_hour_end : string
-        format = 'dd-mm-yy hh:mm:ss'.
+    date_hour_in : string or datetime
+        format = 'dd-mm-yy hh:mm:ss' if string.
+    date_hour_end : string or datetime
+        format = 'dd-mm-yy hh:mm:ss' if string.
 
     Returns
     -------
@@ -30,22 +66,39 @@ def time_difference(date_hour_in: str, date_hour_end: str) -> float:
 
     '''
     
-    try:
-        tmp_date_hour_in = dt.strptime(date_hour_in,'%Y-%m-%d %H:%M:%S')
-    except ValueError as msg:
-        print(msg)
-        tmp_date_hour_in = dt.strptime(date_hour_in,'%Y-%m-%d %H:%M:%S.%f')
-        
-    try:
-        tmp_date_hour_end = dt.strptime(date_hour_end,'%Y-%m-%d %H:%M:%S')
-    except ValueError as msg:
-        print(msg)
-        tmp_date_hour_end = dt.strptime(date_hour_end,'%Y-%m-%d %H:%M:%S.%f')
+    tmp_date_hour_in = _parse_datetime(date_hour_in)
+    tmp_date_hour_end = _parse_datetime(date_hour_end)
     
     elapsed_time = tmp_date_hour_end - tmp_date_hour_in
     
     return float(elapsed_time.total_seconds())
 
+def time_differences(dates_hours_in, dates_hours_end) -> np.ndarray:
+    '''
+    Vectorized version of time_difference for arrays of dates and hours
+
+    Parameters
+    ----------
+    dates_hours_in : array_like of strings or datetimes
+        Start dates, format = 'yyyy-mm-dd hh:mm:ss[.ffffff]' if strings.
+    dates_hours_end : array_like of strings or datetimes
+        End dates, format = 'yyyy-mm-dd hh:mm:ss[.ffffff]' if strings.
+
+    Returns
+    -------
+    elapsed_times : np.ndarray
+        Elapsed times (s).
+
+    '''
+    
+    # Parse the whole arrays at once; ISO8601 accepts both with and without fractional seconds
+    tmp_dates_hours_in = pd.to_datetime(np.asarray(dates_hours_in), format='ISO8601')
+    tmp_dates_hours_end = pd.to_datetime(np.asarray(dates_hours_end), format='ISO8601')
+    
+    elapsed_times = tmp_dates_hours_end - tmp_dates_hours_in
+    
+    return elapsed_times.total_seconds().to_numpy(dtype=float)
+
 #%% Function to calculate decay constant and its error
 
 def get_lambda_err(hf: float, err_hf: float, uom: str) -> Tuple[float, float]:
@@ -63,33 +116,65 @@ def get_lambda_err(hf: float, err_hf: float, uom: str) -> Tuple[float, float]:
         tuple: (decay constant, error of decay constant)
     """
     
-    if uom == "s":
-        tmp_hf = hf
-        tmp_err_hf = err_hf
-    elif uom == "m":
-        tmp_hf = hf * 60
-        tmp_err_hf = err_hf * 60
-    elif uom == "h":
-        tmp_hf = hf * 60 * 60
-        tmp_err_hf = err_hf * 60 * 60
-    elif uom == "d":
-        tmp_hf = hf * 60 * 60 * 24
-        tmp_err_hf = err_hf * 60 * 60 * 24
-    elif uom == "y":
-        tmp_hf = hf * 60 * 60 * 24 * 365
-        tmp_err_hf = err_hf * 60 * 60 * 24 * 365
-    else:
+    try:
+        factor = _UOM_SECONDS[uom]
+    except KeyError:
         raise ValueError('No unit of measure for the half-life.')
+    
+    tmp_hf = hf * factor
+    tmp_err_hf = err_hf * factor
         
-    Lambda = log(2) / tmp_hf
-    err_Lambda = Lambda**2 * tmp_err_hf / log(2)
+    Lambda = LN2 / tmp_hf
+    err_Lambda = Lambda**2 * tmp_err_hf / LN2
+    
+    return Lambda, err_Lambda
+
+def get_lambdas_errs(hfs, err_hfs, uoms) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Vectorized version of get_lambda_err for arrays of half-lives
+
+    Parameters
+    ----------
+    hfs : array_like of floats
+        Half-lives.
+    err_hfs : array_like of floats
+        Errors of half-lives.
+    uoms : array_like of strings
+        Units of measure of half-lives.
+
+    Raises
+    ------
+    ValueError
+        Wrong unit of measure.
+
+    Returns
+    -------
+    Lambda : np.ndarray
+        Decay constants (s^-1).
+    err_Lambda : np.ndarray
+        Errors of decay constants (s^-1).
+
+    '''
+    
+    # One multiplicative factor per unit of measure
+    try:
+        factors = np.fromiter((_UOM_SECONDS[uom] for uom in uoms), dtype=float)
+    except KeyError:
+        raise ValueError('No unit of measure for the half-life.') from None
+    
+    tmp_hf = np.asarray(hfs, dtype=float) * factors
+    tmp_err_hf = np.asarray(err_hfs, dtype=float) * factors
+    
+    Lambda = LN2 / tmp_hf
+    err_Lambda = Lambda**2 * tmp_err_hf / LN2
     
     return Lambda, err_Lambda
 
 #%% Load configuration JSON file
 
-def load_config() -> dict:
-    ''' Load configuration JSON file '''
+@lru_cache(maxsize=1)
+def load_config() -> Mapping[str, str]:
+    ''' Load configuration JSON file (parsed once, returned as read-only mapping) '''
     
     # Root directory
     root_directory = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
@@ -110,5 +195,145 @@ def load_config() -> dict:
     # Convert relative paths to absolute paths by combining with project root
     for key in config.keys():
         config[key] = os.path.join(project_root, config[key])
-        
-    return config
\ No newline at end of file
+    
+    # Read-only view so that callers cannot alter the cached configuration
+    return MappingProxyType(config)
+
+#%% Cache of file contents invalidated by modification time
+
+def cached_by_mtime(func):
+    '''
+    Cache the result of a function of a file path until the file is modified.
+    
+    Only one entry is kept per path: a new modification time replaces the
+    previous result instead of accumulating every version of the file.
+    '''
+    cache = {}
+    
+    @wraps(func)
+    def wrapper(filepath):
+        mtime = os.path.getmtime(filepath)
+        entry = cache.get(filepath)
+        if entry is None or entry[0] != mtime:
+            entry = cache[filepath] = (mtime, func(filepath))
+        return entry[1]
+    
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+#%% Load Excel workbooks
+
+@cached_by_mtime
+def load_workbook(filepath: str) -> Dict[str, pd.DataFrame]:
+    '''
+    Load all the sheets of an Excel workbook, parsed once per file path and modification time
+
+    Parameters
+    ----------
+    filepath : str
+        File path of the Excel workbook.
+
+    Raises
+    ------
+    FileNotFoundError
+        Workbook not found.
+
+    Returns
+    -------
+    sheets : dict of pandas.DataFrame
+        Sheets of the workbook keyed by sheet name. They are shared between
+        callers and must not be modified in place.
+
+    '''
+    
+    # A workbook modified on disk is parsed again instead of serving a stale copy
+    return pd.read_excel(filepath, sheet_name=None, engine=EXCEL_ENGINE)
+
+#%% List indexed by a key attribute of its items
+
+class IndexedList(list):
+    '''
+    List whose items can also be looked up by one of their attributes.
+    
+    The index is built lazily on the first look-up and dropped by every
+    in-place change of the list, so that it never goes out of sync. The
+    first occurrence of a key wins, as in a linear scan.
+    '''
+    
+    # Attribute of the items used as look-up key
+    _key_attr = 'name'
+    _index = None
+    
+    def _reindex(self):
+        self._index = None
+    
+    def _lookup(self, key):
+        ''' Item with the given key (KeyError if none) '''
+        if self._index is None:
+            index = {}
+            for item in self:
+                index.setdefault(getattr(item, self._key_attr), item)
+            self._index = index
+        return self._index[key]
+    
+    def append(self, item):
+        super().append(item)
+        if self._index is not None:
+            self._index.setdefault(getattr(item, self._key_attr), item)
+    
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._reindex()
+    
+    def extend(self, other):
+        super().extend(other)
+        self._reindex()
+    
+    def __iadd__(self, other):
+        # list.__iadd__ does not go through extend, which may check the items
+        self.extend(other)
+        return self
+    
+    def __imul__(self, n):
+        super().__imul__(n)
+        self._reindex()
+        return self
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._reindex()
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._reindex()
+    
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._reindex()
+        return item
+    
+    def remove(self, item):
+        super().remove(item)
+        self._reindex()
+    
+    def clear(self):
+        super().clear()
+        self._reindex()
+    
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._reindex()
+    
+    def reverse(self):
+        super().reverse()
+        self._reindex()
+    
+    def copy(self):
+        # Same type with its own index instead of a plain list
+        return type(self)(list(self))
+    
+    __copy__ = copy
+    
+    def __reduce__(self):
+        # Rebuilt through the constructor (pickle and deepcopy), the index is not stored
+        return type(self), (list(self),)
@@ -2,10 +2,10 @@
 
 import numpy as np
 import pandas as pd
-from scipy.interpolate import interp1d
 from os import listdir
 from os.path import join
 import re
+from functools import lru_cache
 
 #%% Custom packages
 
@@ -13,7 +13,12 @@ from .core.utils import load_config
 
 #%% Monitor cross sections
 
-pattern = r'[a-zA-Z]+\-\d+'
+_NUC_RE = re.compile(r'[A-Za-z]+-\d+')
+
+@lru_cache(maxsize=1)
+def _xs_filepaths(dir_xs_data: str) -> dict:
+    ''' File paths of monitor cross sections keyed by nuclide (directory scanned once) '''
+    return {f.split('.')[0]: join(dir_xs_data, f) for f in listdir(dir_xs_data)}
 
 def load_monitor_cross_section(nuc: str):
     '''
@@ -40,14 +45,14 @@ def load_monitor_cross_section(nuc: str):
 
     '''
     
-    if not re.fullmatch(pattern, nuc):
+    if not _NUC_RE.fullmatch(nuc):
         raise ValueError(f"Input nuclide name '{nuc}' does not match the required input pattern: (Chemical element)-(Mass No.).") 
     
     # Load configuration file
     config = load_config()
     
     # Get file paths of monitor cross sections
-    filepaths_xs = {f.split('.')[0]: join(config['DIR_XS_DATA'],f) for f in listdir(config['DIR_XS_DATA'])}
+    filepaths_xs = _xs_filepaths(config['DIR_XS_DATA'])
     
     # Check if the nuclide exists in the directory
     if nuc not in filepaths_xs:
@@ -65,14 +70,47 @@ def load_monitor_cross_section(nuc: str):
 
 #%% Function to linearly interpolate cross section function
 
+def linear_interpolator(x, y):
+    '''
+    Build a linear interpolation function based on numpy.interp
+
+    Parameters
+    ----------
+    x : array_like
+        Tabulated abscissae, e.g., energy (MeV).
+    y : array_like
+        Tabulated values.
+
+    Returns
+    -------
+    f : callable
+        Function evaluating the linear interpolation. It raises a ValueError
+        outside the tabulated range, as scipy.interpolate.interp1d does.
+
+    '''
+    
+    # numpy.interp requires increasing abscissae
+    order = np.argsort(x, kind='stable')
+    xp = np.asarray(x, dtype=float)[order]
+    fp = np.asarray(y, dtype=float)[order]
+    
+    def f(x_new):
+        if np.any(x_new < xp[0]) or np.any(x_new > xp[-1]):
+            raise ValueError(f"A value in {x_new} is outside the interpolation range [{xp[0]}, {xp[-1]}].")
+        return np.interp(x_new, xp, fp)
+    
+    return f
+
+@lru_cache(maxsize=None)
 def interpolate_cross_section(nuclide: str):
-    ''' Interpolate tabulated data of Padé approximants of monitor cross sections '''
+    ''' Interpolate tabulated data of Padé approximants of monitor cross sections
+    (cached per nuclide, the returned interpolators are shared between callers) '''
     
     # Load cross section -> pandas.DataFrame: energy, data, uncert
     cross_section = load_monitor_cross_section(nuclide)
     
     # Interpolate cross section 
-    f_xs = interp1d(cross_section.energy, cross_section.data, kind='linear')
-    f_unc_xs = interp1d(cross_section.energy, cross_section.uncert, kind='linear')
+    f_xs = linear_interpolator(cross_section.energy, cross_section.data)
+    f_unc_xs = linear_interpolator(cross_section.energy, cross_section.uncert)
     
     return f_xs, f_unc_xs
\ No newline at end of file
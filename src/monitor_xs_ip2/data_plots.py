@@ -1,23 +1,22 @@
 #%% Relevant packages
 
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 from os.path import join
 import xlsxwriter
 
 #%% Custom packages
 
-from .core.utils import load_config
-
-config = load_config()
+from .core.utils import load_config, load_workbook
 
 #%% Print results of test targets in Excel file
 
 def print_test_target_results(targets, dir_to_save):
     
+    config = load_config()
+    
     # Get radionuclides produced according to target material
-    df = pd.read_excel(config['MATERIALS_DATA'], sheet_name='Material_NuclideInventory')
+    df = load_workbook(config['MATERIALS_DATA'])['Material_NuclideInventory']
     
     # Define common headers
     headers = [
@@ -27,12 +26,16 @@ def print_test_target_results(targets, dir_to_save):
         ]
     
     # Define headers specific to target material
-    head_nucs_eval = {material: [nuc+'_eval' for nuc in df[material].dropna().to_list()] for material in df.columns}
-    head_nucs = {material: df[material].dropna().to_list() for material in df.columns}
-    head_err_nucs = {material: ['err_'+nuc for nuc in df[material].dropna().to_list()] for material in df.columns}
+    head_nucs_eval, head_nucs, head_err_nucs = {}, {}, {}
+    for material in df.columns:
+        nucs = df[material].dropna().to_list()
+        head_nucs[material] = nucs
+        head_nucs_eval[material] = [nuc+'_eval' for nuc in nucs]
+        head_err_nucs[material] = ['err_'+nuc for nuc in nucs]
     
-    # Create workbook and add worksheet
-    workbook = xlsxwriter.Workbook(join(dir_to_save, 'results.xlsx'))
+    # Create workbook and add worksheet (constant memory: each row is flushed to disk once
+    # the next one is started, rows are written in ascending order on each sheet)
+    workbook = xlsxwriter.Workbook(join(dir_to_save, 'results.xlsx'), {'constant_memory': True})
     worksheets = {material: workbook.add_worksheet(material+'_foils') for material in df.columns}
     
     # Define cell formats
@@ -65,20 +68,12 @@ def print_test_target_results(targets, dir_to_save):
                 worksheets[material].write_number(row[material], col, t.energy)
                 col += 1
                 
-                # Print EoB activities for each radionuclide evaluate using monitor XS and BDSIM
-                for r in t.radionuclides:
-                    worksheets[material].write_number(row[material], col, r.act_eob_eval, num_value_fmt)
-                    col += 1
-                
-                # Print mean EoB activity for each radionuclide
-                for r in t.radionuclides:
-                    worksheets[material].write_number(row[material], col, r.mean_act_eob, num_value_fmt)
-                    col += 1
-                    
-                # Print error of mean EoB activity for each radionuclide
-                for r in t.radionuclides:
-                    worksheets[material].write_number(row[material], col, r.err_mean_act_eob, num_value_fmt)
-                    col += 1
+                # Print EoB activities evaluated using monitor XS and BDSIM, mean EoB activities
+                # and their errors for each radionuclide, in a single row write
+                values = [r.act_eob_eval for r in t.radionuclides] + \
+                    [r.mean_act_eob for r in t.radionuclides] + \
+                    [r.err_mean_act_eob for r in t.radionuclides]
+                worksheets[material].write_row(row[material], col, values, num_value_fmt)
                 
                 # Increment row position counting
                 row[material] += 1
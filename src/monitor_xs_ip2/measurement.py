@@ -1,22 +1,19 @@
 #%% Relevant packages
 
 import numpy as np
-import pandas as pd
 from datetime import datetime as dt
 
 #%% Custom packages
 
 from .radionuclide import Radionuclide, RadionuclideList
-from .core.utils import time_difference, load_config
-
-config = load_config()
+from .core.utils import time_difference, load_config, load_workbook
 
 #%% Functions related to Measurement class
 
 def get_datetime_meas(measurement):
     ''' Function to help sorting the measurements list '''
     if isinstance(measurement, Measurement):
-        return dt.strptime(measurement.meas_date, "%Y-%m-%d %H:%M:%S")
+        return measurement._meas_dt
     raise TypeError(f'{measurement} is not a Measurement class.')
 
 #%% Measurement class
@@ -59,8 +56,9 @@ class Measurement:
 
         '''
 
-        # Validate date format early to fail fast on malformed reports.
-        dt.strptime(meas_date, "%Y-%m-%d %H:%M:%S")
+        # Validate date format early to fail fast on malformed reports,
+        # the parsed datetime is kept for sorting, comparisons and cooling time
+        self._meas_dt: dt = dt.strptime(meas_date, "%Y-%m-%d %H:%M:%S")
 
         self.meas_date: str = meas_date
         self.level: str = level
@@ -71,19 +69,24 @@ class Measurement:
         self.t_cool: float = 0.0
         self.err_t_cool: float = 0.0
         
-        # Check file existence before proceeding
+        config = load_config()
+        
+        # Check file existence before proceeding (workbooks are parsed only once)
         try:
-            df = pd.read_excel(config['GL_FILEPATH'], sheet_name="NuclideData", usecols="A:E")
+            df = load_workbook(config['GL_FILEPATH'])["NuclideData"].iloc[:, :5]
         except FileNotFoundError:
             raise FileNotFoundError(f"File {config['GL_FILEPATH']} not found.")
         except Exception as e:
             raise Exception(f"Error reading the Excel file: {str(e)}")
             
         # Load radionuclides present in a specific target material
-        df_nuc_inventory = pd.read_excel(config['MATERIALS_DATA'], sheet_name='Material_NuclideInventory')
+        df_nuc_inventory = load_workbook(config['MATERIALS_DATA'])['Material_NuclideInventory']
         if tar_mat not in df_nuc_inventory.columns:
             raise ValueError(f"Target material '{tar_mat}' not found in Material_NuclideInventory sheet.")
         
+        # Keep only the radionuclides produced in the target material (hashed, vectorized filter)
+        df = df[df.nuclide.isin(df_nuc_inventory[tar_mat].dropna())]
+        
         # Initialize radionuclide list
         self.radionuclides = RadionuclideList(
             [Radionuclide(
@@ -91,22 +94,26 @@ class Measurement:
                 hf,
                 err_hf,
                 uom,
-                Ey_s) for nuc, hf, err_hf, uom, Ey_s in zip(
-                        df.nuclide,
-                        df.half_life,
-                        df.err_half_life,
-                        df.uom,
-                        df.selected_g_line) if nuc in df_nuc_inventory[tar_mat].to_list()
+                Ey_s) for nuc, hf, err_hf, uom, Ey_s in df[[
+                    'nuclide',
+                    'half_life',
+                    'err_half_life',
+                    'uom',
+                    'selected_g_line']].itertuples(index=False)
                 ]
             )
         
-        # Load gamma lines for each radionuclide
+        # Load gamma lines for each radionuclide from the sheets parsed in a single read
+        # (copies, since the cached sheets are shared)
+        gamma_lines_sheets = load_workbook(config['GL_FILEPATH'])
         for radionuclide in self.radionuclides:
             try:
-                gamma_lines = pd.read_excel(config['GL_FILEPATH'], sheet_name=radionuclide.name)
-                radionuclide.g_energies = gamma_lines.energy.to_numpy()
-                radionuclide.intensities = gamma_lines.intensity.to_numpy()
-                radionuclide.err_intensities = gamma_lines.err_intensity.to_numpy()
+                gamma_lines = gamma_lines_sheets[radionuclide.name]
+                radionuclide.set_gamma_lines(
+                    gamma_lines.energy.to_numpy(dtype=np.float64, copy=True),
+                    gamma_lines.intensity.to_numpy(dtype=np.float64, copy=True),
+                    gamma_lines.err_intensity.to_numpy(dtype=np.float64, copy=True)
+                    )
             except FileNotFoundError:
                 raise FileNotFoundError(f"Gamma line data for {radionuclide.name} not found in the Excel file.")
             except Exception as e:
@@ -127,7 +134,7 @@ class Measurement:
         None.
 
         '''
-        self.t_cool = time_difference(datetime_irr_end, self.meas_date)
+        self.t_cool = time_difference(datetime_irr_end, self._meas_dt)
         self.err_t_cool = 2  # (s)
     
     def get_net_counts(self, report):
@@ -152,37 +159,54 @@ class Measurement:
         if not (report_energy.size == report_counts.size == report_err_counts.size):
             raise ValueError("Report arrays energy/net_counts/err_net_counts must have the same length.")
 
-        for r in self.radionuclides:  # go through the radionuclide list
-            matched_counts = []
-            matched_err_counts = []
-
-            for Ey_s in r.g_energies:  # go through selected gamma lines
-                mask = np.abs(report_energy - Ey_s) < 1.0
-                if not np.any(mask):
-                    matched_counts.append(0.0)
-                    matched_err_counts.append(0.0)
-                    continue
-
-                candidate_idx = np.where(mask)[0]
-                closest_local_idx = np.argmin(np.abs(report_energy[candidate_idx] - Ey_s))
-                idx = candidate_idx[closest_local_idx]
-
-                matched_counts.append(float(report_counts[idx]))
-                matched_err_counts.append(float(report_err_counts[idx]))
-
-            self.radionuclides[r].net_counts = np.asarray(matched_counts, dtype=float)
-            self.radionuclides[r].err_net_counts = np.asarray(matched_err_counts, dtype=float)
+        # Selected gamma lines of all the radionuclides in a single array
+        n_lines = [r.g_energies.size for r in self.radionuclides]
+        Ey_s = np.concatenate([r.g_energies for r in self.radionuclides]) if n_lines else np.empty(0)
+        
+        matched_counts = np.zeros(Ey_s.size)
+        matched_err_counts = np.zeros(Ey_s.size)
+        
+        if Ey_s.size and report_energy.size:
+            # Closest peak of each gamma line by binary search on the sorted report energies
+            # (stable sort, so that equal energies keep the order of the report)
+            order = np.argsort(report_energy, kind='stable')
+            energy_sorted = report_energy[order]
+            right = np.searchsorted(energy_sorted, Ey_s, side='left')
+            left = np.maximum(right - 1, 0)
+            right = np.minimum(right, energy_sorted.size - 1)
+            
+            # First peak of each run of equal energies, as the first one wins on ties
+            left = np.searchsorted(energy_sorted, energy_sorted[left], side='left')
+            right = np.searchsorted(energy_sorted, energy_sorted[right], side='left')
+            
+            # Nearest neighbour, the one first in the report on equal deviations
+            dev_left = np.abs(energy_sorted[left] - Ey_s)
+            dev_right = np.abs(energy_sorted[right] - Ey_s)
+            take_right = (dev_right < dev_left) | ((dev_right == dev_left) & (order[right] < order[left]))
+            idx = order[np.where(take_right, right, left)]
+            
+            # Match if within 1 keV
+            found = np.where(take_right, dev_right, dev_left) < 1.0
+            matched_counts[found] = report_counts[idx[found]]
+            matched_err_counts[found] = report_err_counts[idx[found]]
+        
+        # Split the matches back per radionuclide
+        bounds = np.cumsum(n_lines)[:-1]
+        for r, counts, err_counts in zip(
+                self.radionuclides,
+                np.split(matched_counts, bounds),
+                np.split(matched_err_counts, bounds)):
+            r.net_counts = counts
+            r.err_net_counts = err_counts
     
     def __eq__(self, datetime_to_compare):
         # Check wether 'datetime_to_compare' is of type datetime.datetime
         if isinstance(datetime_to_compare, dt):
-            datetime_meas = dt.strptime(self.meas_date, "%Y-%m-%d %H:%M:%S")
-            return datetime_to_compare == datetime_meas
+            return datetime_to_compare == self._meas_dt
 
         if isinstance(datetime_to_compare, str):
-            datetime_meas = dt.strptime(self.meas_date, "%Y-%m-%d %H:%M:%S")
             datetime_to_compare_dt = dt.strptime(datetime_to_compare, "%Y-%m-%d %H:%M:%S")
-            return datetime_to_compare_dt == datetime_meas
+            return datetime_to_compare_dt == self._meas_dt
 
         return NotImplemented
     
@@ -1,13 +1,25 @@
 #%% Relevant packages
 
 import numpy as np
-import pandas as pd
 from typing import List
 from periodictable import elements
 
 #%% Custom packages
 
-from .core.utils import load_config
+from .core.utils import load_config, load_workbook, cached_by_mtime
+
+#%% Proton beam characteristics indexed by degrader
+
+@cached_by_mtime
+def _beam_characteristics(filepath):
+    ''' Beam characteristics keyed by degrader: (energy, err_energy, current), built once per workbook version '''
+    df = load_workbook(filepath)['BeamCharacteristics']
+    
+    # First occurrence of each degrader, as with the former boolean masks and .iloc[0]
+    table = {}
+    for degrader, energy, err_energy, current in zip(df.degrader, df.energy, df.err_energy, df.current):
+        table.setdefault(degrader, (energy, err_energy, current))
+    return table
 
 #%% Proton beam characteristics
 
@@ -19,13 +31,13 @@ class ProtonBeam():
         # Load configuration file
         config = load_config()
         
-        # Load proton beam characteristics simulated with BDSIM
-        df = pd.read_excel(config['PROTON_BEAM'], sheet_name='BeamCharacteristics')
+        # Load proton beam characteristics simulated with BDSIM (read once, O(1) look-up)
+        beam_characteristics = _beam_characteristics(config['PROTON_BEAM'])
+        if degrader not in beam_characteristics:
+            raise ValueError(f"Degrader '{degrader}' not found in BeamCharacteristics sheet.")
         
         # Initialize relevant attributes
-        self.energy = df.energy[df.degrader == degrader].iloc[0]
-        self.err_energy = df.err_energy[df.degrader == degrader].iloc[0]
-        self.current = df.current[df.degrader == degrader].iloc[0]
+        self.energy, self.err_energy, self.current = beam_characteristics[degrader]
     
     def __str__(self):
         return f"Proton beam: {self.energy:.1f} MeV, {self.current:.1f} uA."
@@ -1,17 +1,80 @@
 #%% Relevant packages
 
 import numpy as np
-from typing import Iterable, List
+from functools import lru_cache
+from typing import Iterable
 from periodictable import elements
 
 #%% Custom packages
 
 from .spectrometry import efficiency_fun
-from .core.utils import get_lambda_err
+from .core.utils import get_lambda_err, IndexedList
+
+#%% Atomic number of chemical elements
+
+@lru_cache(maxsize=128)
+def _atomic_number(symbol: str) -> int:
+    ''' Atomic number of a chemical element (periodictable look-up cached per symbol) '''
+    return elements.symbol(symbol).number
+
+#%% Correction factors of gamma measurements
+
+def measurement_corrections(Lambda, err_Lambda, real_time, live_time):
+    '''
+    Calculates the dead-time and decay-during-acquisition correction factors.
+
+    Parameters
+    ----------
+    Lambda : float or np.ndarray
+        Decay constant(s) (s^-1).
+    err_Lambda : float or np.ndarray
+        Error(s) of decay constant(s) (s^-1).
+    real_time : float
+        Real time (s).
+    live_time : float
+        Live time (s).
+
+    Returns
+    -------
+    tuple
+        (C_dt, err_C_dt, C_meas, err_C_meas), the decay factors having the
+        same shape as Lambda.
+
+    '''
+    if real_time <= 0 or live_time <= 0:
+        raise ValueError("real_time and live_time must be positive.")
+
+    err_real_time = err_live_time = 0.0
+    
+    # Correction factor due to dead time
+    C_dt = real_time / live_time
+    err_C_dt = C_dt * np.sqrt((err_live_time / live_time) ** 2 + (err_real_time / real_time) ** 2)
+    
+    # Correction factor due to radioactive decay of the source
+    # expm1 avoids cancellation in 1 - exp(-x) for long-lived radionuclides
+    x = Lambda * real_time
+    one_minus_exp = -np.expm1(-x)
+    C_meas = Lambda / one_minus_exp
+    temp = one_minus_exp - x * (1 - one_minus_exp)  # 1 - exp(-x) * (1 + x)
+    err_C_meas = temp / (one_minus_exp ** 2) * err_Lambda
+    
+    return C_dt, err_C_dt, C_meas, err_C_meas
 
 #%% Radionuclide and RadionuclideList classes
 
 class Radionuclide:
+    # Attributes stored in slots instead of a per-instance __dict__.
+    # Subclasses must declare __slots__ too for any new attribute.
+    __slots__ = (
+        'name', 'half_life', 'err_half_life', 'uom', '_g_line',
+        'Lambda', 'err_Lambda',
+        '_g_energies', 'intensities', 'err_intensities', '_g_line_idx',
+        'net_counts', 'err_net_counts',
+        'act', 'err_act', 'act_eob', 'err_act_eob',
+        'mean_act_eob', 'err_mean_act_eob', 'act_eob_eval',
+        'thin_target_yield', 'err_thin_target_yield',
+        )
+    
     def __init__(
         self,
         name: str,
@@ -42,38 +105,91 @@ class Radionuclide:
         self.half_life: float = half_life
         self.err_half_life: float = err_half_life
         self.uom: str = uom
+        self._g_line_idx = None  # index of the gamma line closest to the main one, see g_line_idx
         self.g_line: float = g_line
         
         # Convert the half-life into decay constant in seconds
         self.Lambda, self.err_Lambda = get_lambda_err(half_life, err_half_life, uom)
         
         # Define later on in script
-        self.g_energies: List[float] = []  # selected gamma-line energies
-        self.intensities: List[float] = []  # gamma-line intensities
-        self.err_intensities: List[float] = []  # errors of gamma-line intensities
+        self.g_energies: np.ndarray = np.empty(0, dtype=np.float64)  # selected gamma-line energies
+        self.intensities: np.ndarray = np.empty(0, dtype=np.float64)  # gamma-line intensities
+        self.err_intensities: np.ndarray = np.empty(0, dtype=np.float64)  # errors of gamma-line intensities
         
         # ***** Additional variables *****
         # Initialization - Used only by Measurements
-        self.net_counts: List[float] = []
-        self.err_net_counts: List[float] = []
+        self.net_counts: np.ndarray = np.empty(0, dtype=np.float64)
+        self.err_net_counts: np.ndarray = np.empty(0, dtype=np.float64)
         
         # Activity measured at the beginning of the gamma measurement
-        self.act: List[float] = []
-        self.err_act: List[float] = []
+        self.act: np.ndarray = np.empty(0, dtype=np.float64)
+        self.err_act: np.ndarray = np.empty(0, dtype=np.float64)
         
         # Also used by Target.calculate_mean_act_eob() to store the non-zero
         # EoB activities of the main gamma line
-        self.act_eob: List[float] = []  # End-of-bombardment activity
-        self.err_act_eob: List[float] = []
+        self.act_eob: np.ndarray = np.empty(0, dtype=np.float64)  # End-of-bombardment activity
+        self.err_act_eob: np.ndarray = np.empty(0, dtype=np.float64)
         
         # Initialization - Used only by Targets
         self.mean_act_eob = 0
         self.err_mean_act_eob = 0
         
+        # EoB activity evaluated with monitor cross sections
+        self.act_eob_eval = 0
+        
         # ***** Variables only for proton irradiation *****
         self.thin_target_yield = 0
         self.err_thin_target_yield = 0
     
+    # Assigning the main gamma line or the gamma-line energies drops the cached index
+    @property
+    def g_line(self) -> float:
+        return self._g_line
+    
+    @g_line.setter
+    def g_line(self, value: float):
+        self._g_line = value
+        self._g_line_idx = None
+    
+    @property
+    def g_energies(self) -> np.ndarray:
+        return self._g_energies
+    
+    @g_energies.setter
+    def g_energies(self, value: np.ndarray):
+        self._g_energies = value
+        self._g_line_idx = None
+    
+    @property
+    def g_line_idx(self):
+        ''' Index of the gamma line closest to the main one (None without gamma lines) '''
+        # Computed on first use rather than at every look-up of the main gamma line
+        if self._g_line_idx is None and self._g_energies is not None and len(self._g_energies) > 0:
+            self._g_line_idx = int(np.argmin(np.abs(np.asarray(self._g_energies, dtype=np.float64) - self._g_line)))
+        return self._g_line_idx
+    
+    def set_gamma_lines(self, g_energies, intensities, err_intensities):
+        '''
+        Stores the gamma lines as float64 arrays.
+
+        Parameters
+        ----------
+        g_energies : array_like
+            Gamma-line energies (keV).
+        intensities : array_like
+            Gamma-line intensities (%).
+        err_intensities : array_like
+            Errors of gamma-line intensities (%).
+
+        Returns
+        -------
+        None.
+
+        '''
+        self.g_energies = np.asarray(g_energies, dtype=np.float64)
+        self.intensities = np.asarray(intensities, dtype=np.float64)
+        self.err_intensities = np.asarray(err_intensities, dtype=np.float64)
+    
     def calculate_activity(self, level, detector, real_time, live_time):
         '''
         Calculates the measured activity and its associated error.
@@ -96,64 +212,42 @@ class Radionuclide:
         None.
 
         '''
-        if real_time <= 0 or live_time <= 0:
-            raise ValueError("real_time and live_time must be positive.")
-
-        err_real_time = err_live_time = 0.0
-        
-        # Correction factor due to dead time
-        C_dt = real_time / live_time
-        err_C_dt = C_dt * np.sqrt((err_live_time / live_time) ** 2 + (err_real_time / real_time) ** 2)
-        
-        # Correction factor due to radioactive decay of the source
-        one_minus_exp = 1 - np.exp(-self.Lambda * real_time)
-        C_meas = self.Lambda / one_minus_exp
-        temp = 1 - np.exp(-self.Lambda * real_time) * (1 + self.Lambda * real_time)
-        err_C_meas = temp / (one_minus_exp ** 2) * self.err_Lambda
+        corrections = measurement_corrections(self.Lambda, self.err_Lambda, real_time, live_time)
+        self._calculate_activity(*corrections, level, detector)
+    
+    def _calculate_activity(self, C_dt, err_C_dt, C_meas, err_C_meas, level, detector):
+        ''' Calculates the activity and its error given the correction factors '''
         
         # Efficiency calculation as a function of the gamma lines energy
         if len(self.g_energies) == 0:
             raise ValueError(f"No gamma-line energies are loaded for radionuclide '{self.name}'.")
 
-        eff, err_eff = zip(*[efficiency_fun(Ey, level, detector) for Ey in self.g_energies])
-        eff = np.asarray(eff, dtype=float)
-        err_eff = np.asarray(err_eff, dtype=float)
-        net_counts = np.asarray(self.net_counts, dtype=float)
-        err_net_counts = np.asarray(self.err_net_counts, dtype=float)
-        intensities = np.asarray(self.intensities, dtype=float) / 100
-        err_intensities = np.asarray(self.err_intensities, dtype=float) / 100
+        eff, err_eff = efficiency_fun(self.g_energies, level, detector)
+        net_counts = self.net_counts
+        err_net_counts = self.err_net_counts
+        intensities = self.intensities / 100
+        err_intensities = self.err_intensities / 100
         
         # Activity calculation
         with np.errstate(divide="ignore", invalid="ignore"):
             self.act = C_dt * C_meas * net_counts / (eff * intensities)
         self.act = np.nan_to_num(self.act, nan=0.0, posinf=0.0, neginf=0.0)
         
-        # Calculation of the error of activity
-        numerator = np.array([
-            err_net_counts,
-            err_eff,
-            err_intensities,
-            ])
-        
-        denominator = np.array([
-            net_counts,
-            eff,
-            intensities
-            ])
-        
-        # Error calculation for the 1D arrays
+        # Calculation of the relative error of activity, accumulated in one array
         with np.errstate(divide="ignore", invalid="ignore"):
-            error_contrib = np.sum((numerator / denominator) ** 2, axis=0)
-        error_contrib = np.nan_to_num(error_contrib, nan=0.0, posinf=0.0, neginf=0.0)
+            error_contrib = (err_net_counts / net_counts) ** 2
+            error_contrib += (err_eff / eff) ** 2
+            error_contrib += (err_intensities / intensities) ** 2
         
         # Add the contributions from the scalar terms
         error_contrib += (err_C_dt / C_dt) ** 2 + (err_C_meas / C_meas) ** 2
         
         # Calculate the final error
-        self.err_act = np.sqrt(error_contrib) * self.act
+        with np.errstate(invalid="ignore"):
+            self.err_act = np.sqrt(error_contrib) * self.act
         
-        # Handle NaN values
-        self.err_act = np.nan_to_num(self.err_act, nan=0.0, posinf=0.0, neginf=0.0)
+        # Handle NaN values (e.g. null net counts or intensities)
+        np.nan_to_num(self.err_act, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
 
     def calculate_eob_act(self, t_cool):
         '''
@@ -178,24 +272,21 @@ class Radionuclide:
         err_C_cool = t_cool * C_cool * self.err_Lambda
 
         # Calculate the end-of-bombardment activity
-        act = np.asarray(self.act, dtype=float)
-        err_act = np.asarray(self.err_act, dtype=float)
+        act = self.act
+        err_act = self.err_act
         self.act_eob = act * C_cool
         
-        # Pre-allocate error array
-        self.err_act_eob = np.zeros_like(self.act_eob)
-
-        # Calculate the error for each element
-        non_zero_mask = act != 0  # Only calculate error for non-zero activity
-
-        # Compute error only where activity is non-zero
-        self.err_act_eob[non_zero_mask] = np.sqrt(
-            (err_act[non_zero_mask] / act[non_zero_mask]) ** 2 +
-            (err_C_cool / C_cool) ** 2
-        ) * self.act_eob[non_zero_mask]
+        # Relative errors, the activity one is computed only where activity is non-zero
+        non_zero_mask = act != 0
+        ratio_act = np.divide(err_act, act, out=np.zeros_like(act), where=non_zero_mask)
+        ratio_cool = err_C_cool / C_cool
         
-        # For zero activity, the error remains zero
-        self.err_act_eob[~non_zero_mask] = 0.0
+        # Quadrature sum of relative errors with a single ufunc reusing the same buffer,
+        # for zero activity the error remains zero
+        np.hypot(ratio_act, ratio_cool, out=ratio_act, where=non_zero_mask)
+        
+        # Absolute error
+        self.err_act_eob = np.multiply(ratio_act, self.act_eob, out=ratio_act)
     
     def __eq__(self, other):
         if isinstance(other, str):
@@ -211,15 +302,18 @@ class Radionuclide:
         return f"Radionuclide('{self.name}', {self.half_life})"
 
 
-class RadionuclideList(list):
+class RadionuclideList(IndexedList):
+    # Radionuclides are looked up by name
+    _key_attr = 'name'
+    
     def __init__(self, list_):
         # Check whether the input is a list
         if not isinstance(list_, list):
-            raise ValueError(f"Input {list_} is not a list.")
+            raise TypeError(f"Input {list_} is not a list.")
 
         invalid_item = next((i for i in list_ if not isinstance(i, Radionuclide)), None)
         if invalid_item is not None:
-            raise ValueError(f"Item {invalid_item} is not of Radionuclide type.")
+            raise TypeError(f"Item {invalid_item} is not of Radionuclide type.")
 
         super().__init__(list_)
     
@@ -227,7 +321,7 @@ class RadionuclideList(list):
         if isinstance(item, Radionuclide):
             super().append(item)
         else:
-            raise ValueError(f'{item} is not of Radionuclide type.')
+            raise TypeError(f'{item} is not of Radionuclide type.')
             
     def insert(self, index, item):
         if isinstance(item, Radionuclide):
@@ -236,18 +330,46 @@ class RadionuclideList(list):
             raise TypeError(f"The {item} to add is not of Radionuclide type.")
     
     def extend(self, other):
-        if not isinstance(other, RadionuclideList):
-            raise TypeError(f"The {other} to extend is not a RadionuclideList.")
-        
+        # Materialize iterators, which would be consumed by the type check
+        other = list(other)
         for item in other:
             if not isinstance(item, Radionuclide):
                 raise TypeError(f"The item {item} to extend is not a Radionuclide.")
         
         super().extend(other)
+    
+    def calculate_activities(self, level, detector, real_time, live_time):
+        '''
+        Calculates the measured activity of all the radionuclides of a gamma measurement.
+
+        Parameters
+        ----------
+        level : str
+            Detector level.
+        detector : str
+            Detector name.
+        real_time : float
+            Real time (s).
+        live_time : float
+            Live time (s).
+
+        Returns
+        -------
+        None.
+
+        '''
+        
+        # Correction factors of all radionuclides computed at once
+        Lambda = np.fromiter((r.Lambda for r in self), dtype=np.float64, count=len(self))
+        err_Lambda = np.fromiter((r.err_Lambda for r in self), dtype=np.float64, count=len(self))
+        C_dt, err_C_dt, C_meas, err_C_meas = measurement_corrections(Lambda, err_Lambda, real_time, live_time)
+        
+        for i, r in enumerate(self):
+            r._calculate_activity(C_dt, err_C_dt, C_meas[i], err_C_meas[i], level, detector)
                 
     @staticmethod
     def get_element_No(isotope):
-        return elements.symbol(isotope.name.split('-')[0]).number
+        return _atomic_number(isotope.name.split('-', 1)[0])
     
     def sort_elements(self, reverse=False):
         self.sort(key=self.get_element_No, reverse=reverse)
@@ -255,16 +377,16 @@ class RadionuclideList(list):
     def __getitem__(self, key):
         # In case I have a string
         if isinstance(key,str):
-            for item in self:
-                if item == key:
-                    return item
-            raise KeyError(f"No radionuclide found with name {key}")
+            try:
+                return self._lookup(key)
+            except KeyError:
+                raise KeyError(f"No radionuclide found with name {key}") from None
             
         elif isinstance(key,Radionuclide):
-            for item in self:
-                if item == key.name:
-                    return item
-            raise KeyError(f"No radionuclide found with name {key}")
+            try:
+                return self._lookup(key.name)
+            except KeyError:
+                raise KeyError(f"No radionuclide found with name {key}") from None
         
         # In case key not string but, e.g., a number
         return super().__getitem__(key)
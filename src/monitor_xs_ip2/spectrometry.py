@@ -2,17 +2,20 @@
 
 import numpy as np
 from numpy import matmul
-from numpy.linalg import inv
 import pandas as pd
 from typing import Dict, List, Tuple
 import re
 from datetime import datetime as dt
+import os
+import sys
+import pickle
+import hashlib
 from os.path import join
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
 #%% Custom packages
 
-from .core.utils import get_lambda_err, time_difference, load_config
+from .core.utils import get_lambdas_errs, time_differences, load_config, load_workbook
 
 #%% Efficiency function
 
@@ -21,8 +24,9 @@ class CalibrationFit:
     p: int
     b: np.ndarray
     X: np.ndarray
-    W: np.ndarray
+    w: np.ndarray
     MSE: float
+    XtWX_inv: np.ndarray
 
 
 def resolve_efficiency_filepath(detector: str, config: dict) -> str:
@@ -36,28 +40,23 @@ def resolve_efficiency_filepath(detector: str, config: dict) -> str:
 
 
 def load_efficiency_sheet(filepath: str, level: str) -> pd.DataFrame:
-    df = pd.read_excel(
-        filepath,
-        sheet_name=level,
-        dtype={"ref_date": str, "datetime_meas": str},
-    ).dropna()
+    # All the levels of a detector share one workbook, opened and parsed once;
+    # dates are kept as parsed since time_differences accepts datetimes as well as strings
+    sheets = load_workbook(filepath)
+    if level not in sheets:
+        raise ValueError(f"Worksheet named '{level}' not found in '{filepath}'.")
+    df = sheets[level].dropna()
     if df.empty:
         raise ValueError(f"No efficiency calibration data found for level '{level}' in '{filepath}'.")
     return df
 
 
 def compute_decay_constants(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
-    lambdas, err_lambdas = zip(
-        *[get_lambda_err(hf, err_hf, uom) for hf, err_hf, uom in zip(df.half_life, df.err_half_life, df.uom)]
-    )
-    return np.array(lambdas, dtype=float), np.array(err_lambdas, dtype=float)
+    return get_lambdas_errs(df.half_life, df.err_half_life, df.uom)
 
 
 def compute_correction_factors(df: pd.DataFrame, lambdas: np.ndarray, err_lambdas: np.ndarray) -> Dict[str, np.ndarray]:
-    t_cool = np.array(
-        [time_difference(ref_date, dt_meas) for ref_date, dt_meas in zip(df.ref_date, df.datetime_meas)],
-        dtype=float,
-    )
+    t_cool = time_differences(df.ref_date, df.datetime_meas)
     t_real = df.t_real.to_numpy(dtype=float)
     t_live = df.t_live.to_numpy(dtype=float)
     if np.any(t_real <= 0) or np.any(t_live <= 0):
@@ -66,9 +65,10 @@ def compute_correction_factors(df: pd.DataFrame, lambdas: np.ndarray, err_lambda
     c_cool = np.exp(lambdas * t_cool)
     err_c_cool = t_cool * c_cool * err_lambdas
 
-    one_minus_exp = 1 - np.exp(-lambdas * t_real)
+    exp_meas = np.exp(-lambdas * t_real)
+    one_minus_exp = 1 - exp_meas
     c_meas = lambdas / one_minus_exp
-    err_c_meas = (1 - np.exp(-lambdas * t_real) * (1 + lambdas * t_real)) / (one_minus_exp ** 2) * err_lambdas
+    err_c_meas = (1 - exp_meas * (1 + lambdas * t_real)) / (one_minus_exp ** 2) * err_lambdas
 
     c_dt = t_real / t_live
     return {
@@ -142,17 +142,19 @@ def fit_weighted_log_polynomial(
     n = energies.size
     X = np.power(np.log(energies)[:, None], np.arange(p))
     Y = np.log(exp_eff)
-    W = np.diag(1 / (err_exp_eff / exp_eff) ** 2)
+    # Weights as a 1D array, i.e. the diagonal of W, broadcast instead of a dense n x n matrix
+    w = 1 / (err_exp_eff / exp_eff) ** 2
 
-    xtw = np.matmul(X.T, W)
+    xtw = X.T * w
     xtwx = np.matmul(xtw, X)
-    b = np.matmul(np.linalg.inv(xtwx), np.matmul(xtw, Y))
+    xtwx_inv = np.linalg.inv(xtwx)
+    b = np.matmul(xtwx_inv, np.matmul(xtw, Y))
 
     res = matmul(X, b) - Y
-    sse = matmul(res.T, matmul(W, res))
+    sse = np.sum(res * res * w)
     mse = float(sse / (n - p))
 
-    return CalibrationFit(p=p, b=b, X=X, W=W, MSE=mse)
+    return CalibrationFit(p=p, b=b, X=X, w=w, MSE=mse, XtWX_inv=xtwx_inv)
 
 
 def efficiency_function_calibration(level, detector, p=5) -> CalibrationFit:
@@ -177,8 +179,68 @@ _CALIBRATION_LEVELS = {
     'West HPGe - WILA': [],
 }
 
+# Calibration fits per detector and level, filled lazily on first use (nothing is read at import)
 HPGe_calibration_params = {detector: {} for detector in _CALIBRATION_LEVELS}
 
+def _calibration_cache_dir():
+    ''' Cache directory under $XDG_CACHE_HOME (~/.cache if unset), None if MONITOR_XS_IP2_NO_CACHE is set '''
+    if os.environ.get('MONITOR_XS_IP2_NO_CACHE'):
+        return None
+    cache_home = os.environ.get('XDG_CACHE_HOME') or join(os.path.expanduser('~'), '.cache')
+    return join(cache_home, 'monitor_xs_ip2')
+
+# Directory of the calibration fits persisted between sessions (None disables the disk cache)
+CALIBRATION_CACHE_DIR = _calibration_cache_dir()
+
+# Version of the cached fits: bump it whenever the fit or the decay-correction math changes
+_CACHE_VERSION = 1
+
+def _cached_efficiency_function_calibration(level: str, detector: str, p: int = 5) -> CalibrationFit:
+    ''' Calibration fit loaded from the disk cache, fitted and stored if missing or outdated '''
+    if CALIBRATION_CACHE_DIR is None:
+        return efficiency_function_calibration(level, detector, p)
+    
+    filepath = resolve_efficiency_filepath(detector, load_config())
+    
+    # The key changes with the cache version, the Python and NumPy versions that pickled the fit,
+    # the calibration file (path and modification time), the level, the polynomial order and the
+    # fields of CalibrationFit, so that stale or incompatible fits are never loaded
+    key = '|'.join([
+        str(_CACHE_VERSION),
+        '.'.join(map(str, sys.version_info[:2])),
+        np.__version__,
+        os.path.abspath(filepath),
+        level,
+        str(p),
+        repr(os.path.getmtime(filepath)),
+        ','.join(f.name for f in fields(CalibrationFit)),
+        ])
+    cache_file = join(CALIBRATION_CACHE_DIR, 'eff_' + hashlib.sha1(key.encode('utf-8')).hexdigest() + '.pkl')
+    
+    try:
+        with open(cache_file, 'rb') as f:
+            fit = pickle.load(f)
+        if isinstance(fit, CalibrationFit):
+            return fit
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+        # Missing, truncated or unreadable cache file (e.g. pickled by another environment): fit again
+        pass
+    
+    fit = efficiency_function_calibration(level, detector, p)
+    
+    # Write to a temporary file first so that a concurrent reader never sees a partial pickle
+    try:
+        os.makedirs(CALIBRATION_CACHE_DIR, exist_ok=True)
+        tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(fit, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        # The cache is an optimization only, e.g. read-only cache directory
+        pass
+    
+    return fit
+
 def _get_calibration_params(level: str, detector: str) -> CalibrationFit:
     if detector not in HPGe_calibration_params:
         raise KeyError(f"Detector '{detector}' is not configured.")
@@ -186,7 +248,7 @@ def _get_calibration_params(level: str, detector: str) -> CalibrationFit:
         raise KeyError(f"Level '{level}' is not configured for detector '{detector}'.")
 
     if level not in HPGe_calibration_params[detector]:
-        HPGe_calibration_params[detector][level] = efficiency_function_calibration(level, detector)
+        HPGe_calibration_params[detector][level] = _cached_efficiency_function_calibration(level, detector)
     return HPGe_calibration_params[detector][level]
 
 
@@ -197,56 +259,96 @@ def efficiency_fun(Ey_s, level, detector):
 
     Parameters
     ----------
-    Ey_s : int, float or list
+    Ey_s : int, float, list or np.ndarray
         Gamma energy/ies where to evaluate the detector efficiency.
 
     Returns
     -------
-    eff_m : flot or list of floats
+    eff_m : float or np.ndarray
         Efficiency value.
-    err_eff_m : float or list of floats
+    err_eff_m : float or np.ndarray
         Error of the efficiency values.
 
     '''
     
-    fit = _get_calibration_params(level, detector)
-    p, b, X, W, MSE = fit.p, fit.b, fit.X, fit.W, fit.MSE
-    xtwx_inv = inv(matmul(matmul(X.T, W), X))
-    
-    if isinstance(Ey_s, list) or isinstance(Ey_s, np.ndarray):
-        eff_m = []
-        err_eff_m = []
-        for ey in Ey_s:
-            if ey <= 0:
-                raise ValueError("Gamma energy must be > 0.")
-            X_m = np.zeros(0)
-            for i in range(p):
-                X_m = np.append(X_m, np.log(ey) ** i)
-            
-            Y_m = matmul(b, X_m)
-            err_Y_m = np.sqrt(MSE * matmul(X_m.T, matmul(xtwx_inv, X_m)))
-            
-            eff_m.append(float(np.exp(Y_m)))
-            err_eff_m.append(float(eff_m[-1] * err_Y_m))
+    # Scalars are evaluated as a one-element array
+    scalar = not (isinstance(Ey_s, list) or isinstance(Ey_s, np.ndarray))
+    if not scalar:
+        energies = np.asarray(Ey_s, dtype=float).ravel()
     elif isinstance(Ey_s, float) or isinstance(Ey_s, int) or isinstance(Ey_s, np.int64):
-        if Ey_s <= 0:
-            raise ValueError("Gamma energy must be > 0.")
-        X_m = np.zeros(0)
-        for i in range(p):
-            X_m = np.append(X_m, np.log(Ey_s) ** i)
-        
-        Y_m = matmul(b, X_m)
-        err_Y_m = np.sqrt(MSE * matmul(X_m.T, matmul(xtwx_inv, X_m)))
-        
-        eff_m = float(np.exp(Y_m))
-        err_eff_m = float(eff_m * err_Y_m)
+        energies = np.array([Ey_s], dtype=float)
     else:
         raise TypeError(f"Unsupported Ey_s type: {type(Ey_s)}")
     
+    if np.any(energies <= 0):
+        raise ValueError("Gamma energy must be > 0.")
+    
+    fit = _get_calibration_params(level, detector)
+    
+    # Powers of the log-energies of all the gamma lines at once (energies x p)
+    X_m = np.log(energies)[:, None] ** np.arange(fit.p)
+    
+    # Fitted log-efficiency and its variance x_m^T (X^T W X)^-1 x_m * MSE for each energy,
+    # (X^T W X)^-1 being computed once with the calibration fit
+    Y_m = matmul(X_m, fit.b)
+    var_Y_m = fit.MSE * np.einsum('ki,ij,kj->k', X_m, fit.XtWX_inv, X_m)
+    
+    eff_m = np.exp(Y_m)
+    err_eff_m = eff_m * np.sqrt(var_Y_m)
+    
+    if scalar:
+        return float(eff_m[0]), float(err_eff_m[0])
+    
     return eff_m, err_eff_m
 
+#%% Regular expressions of report files (compiled once)
+
+# InterWinner: acquisition data and attribute where to store them
+_INTERWINNER_ACQ_PATTERNS = [
+    (re.compile(r'Acq\.time \(live\):\s+([\d\.]+)\s+s'), 'live_time'),
+    (re.compile(r'Acq\.time \(real\):\s+([\d\.]+)\s+s'), 'real_time'),
+    (re.compile(r'Acquisition date:\s+([\d\.:\s]+)'), 'datetime_meas'),
+    (re.compile(r'\s*(Rille\s\d+)'), 'detector_level'),
+    ]
+# r'Comment:\s*(?:[^\n]*)\n\s*(Rille\s\d+)'
+
+# InterWinner: markers of the peak table, from the candidate to the confirmed isotopes list
+_INTERWINNER_TABLE_START = 'List by energies (with candidate isotopes)'
+_INTERWINNER_TABLE_END = 'List by energies (with confirmed isotopes)'
+
+# InterWinner: peak data, one match per line of the table ([^\S\n] and [ \t] are whitespaces
+# that do not span lines, so the patterns can be scanned over the whole table at once)
+# When there is NETTO-NULL
+_INTERWINNER_DATA_NETTO_NUL_RE = re.compile(r'\|[^\S\n]*\d+\|[\\\/\| \t]*(\d+\.\d+)[^\S\n]*\|[ \t\d\.\d\*]*\|[\d\. \t\*]+?\|[^\S\n]*\d+\|[^\S\n]*(\d+\.\d*)[^\S\n]*\|[\d\. \t]+?\|[^\S\n]*(\d+\.\d+).*$', re.MULTILINE)
+# When there is NET only
+_INTERWINNER_DATA_NET_RE = re.compile(r'\|[^\S\n]*\d+\|[\\\/\| \t]*(\d+\.\d+)[^\S\n]*\|[ \t\d\.\d\*]*\|[\d\. \t\*]+?\|[^\S\n]*\d+\|[^\S\n]*(\d+\.\d*)[^\S\n]*\|[^\S\n]*(\d+\.\d+).*$', re.MULTILINE)
+
+# InterWinner: header pattern to check is there is NET only or NET-NUL (only whether it
+# occurs matters, so it stops at the last column instead of running to the end of the report)
+_INTERWINNER_HEADER_RE = re.compile(r'\|No\.\|\s+Energy\s+\|[\s+]?FWHM\s+\|[\s+]?FWTM\s+\|\s+GROSS\s+\|\s+NET\s+\|\s+NETTO-NUL\s+\|UNCERT\[\%\]\|\s+EFF\.\[\%\]\s+\|\s+ISOTOPE\s+\|')
+
+# Genie2K: acquisition data and attribute where to store them
+_GENIE2K_ACQ_PATTERNS = [
+    (re.compile(r'Sample ID\s+:\s(\S+)\s+$', re.MULTILINE), 'tar_id'),
+    (re.compile(r'Detector level\s+:\s(.+?\scm)\s+$', re.MULTILINE), 'detector_level'),
+    (re.compile(r'Detector\s+:\s(.*?)\s*$', re.MULTILINE), 'detector'),
+    (re.compile(r'Acquisition Time\s+:\s+(\d{2}\.\d{2}\.\d{4} \d{2}:\d{2}:\d{2})\s*$', re.MULTILINE), 'datetime_meas'),
+    (re.compile(r'Live Time\s+:\s+([\d.]+)\sseconds$', re.MULTILINE), 'live_time'),
+    (re.compile(r'Real Time\s+:\s+([\d.]+)\sseconds$', re.MULTILINE), 'real_time'),
+    ]
+
+# Genie2K: header of the peak table and peak data, within a single line
+_GENIE2K_HEADER_RE = re.compile(r'[^\S\n]*Peak[^\S\n]+ROI[^\S\n]+ROI[^\S\n]+Peak[^\S\n]+Energy[^\S\n]+FWHM[^\S\n]+Net Peak[^\S\n]+Net Area[^\S\n]+Continuum[^\S\n]*$', re.MULTILINE)
+_GENIE2K_DATA_RE = re.compile(r'[^\S\n]*[mM]?[^\S\n]*\d+[^\S\n]+\d+-[^\S\n]*\d+[^\S\n]+[\d.]+[^\S\n]+([\d.]+)[^\S\n]+[\d.]+[^\S\n]+([\d.E+]+)[^\S\n]+([\d.]+)[^\S\n]+[\d.E+]+[^\S\n]*$', re.MULTILINE)
+
 #%% Report class of measurements
 
+def _read_report(filepath: str) -> str:
+    ''' Read a report file in binary mode and decode it once, with universal newlines '''
+    with open(filepath, 'rb') as file:
+        report = file.read().decode('utf-8', errors='ignore')
+    return report.replace('\r\n', '\n').replace('\r', '\n')
+
 class Report:
     ''' Model the spectrometry report '''
     
@@ -267,76 +369,55 @@ class Report:
         # Detector
         self.detector = 'OIPA Lab 35'
         
-        # Data patterns to match
-        acq_data_patterns = [r'Acq\.time \(live\):\s+([\d\.]+)\s+s',
-                             r'Acq\.time \(real\):\s+([\d\.]+)\s+s',
-                             r'Acquisition date:\s+([\d\.:\s]+)',
-                             r'\s*(Rille\s\d+)']
-        # r'Comment:\s*(?:[^\n]*)\n\s*(Rille\s\d+)'
-        
-        keys_data_patterns = ['live_time',
-                              'real_time',
-                              'datetime_meas',
-                              'detector_level']
+        # Load report file in binary mode (should be faster)
+        report = _read_report(self.filepath)
+        has_netto_null = _INTERWINNER_HEADER_RE.search(report) is not None
+        pattern_data = _INTERWINNER_DATA_NETTO_NUL_RE if has_netto_null else _INTERWINNER_DATA_NET_RE
         
-        # Check when to start collecting
-        start_collecting = False
+        # Line where the confirmed isotopes list starts, which ends the scan of the report
+        end = report.find(_INTERWINNER_TABLE_END)
+        end_line_start = report.rfind('\n', 0, end) + 1 if end >= 0 else len(report)
+        end_line_end = report.find('\n', end) if end >= 0 else -1
+        if end_line_end < 0:
+            end_line_end = len(report)
         
-        # Pattern data
-        # When there is NETTO-NULL
-        pattern_data_1 = r'\|\s*\d+\|[\\\/\|\s]*(\d+\.\d+)\s*\|[\s\d\.\d\*]*\|[\d\.\s\*]+?\|\s*\d+\|\s*(\d+\.\d*)\s*\|[\d\.\s]+?\|\s*(\d+\.\d+).*$'
-        # When there is NET only
-        pattern_data_2 = r'\|\s*\d+\|[\\\/\|\s]*(\d+\.\d+)\s*\|[\s\d\.\d\*]*\|[\d\.\s\*]+?\|\s*\d+\|\s*(\d+\.\d*)\s*\|\s*(\d+\.\d+).*$'
+        # Acquisition data, line by line up to the end of the scan
+        for line in report[:end_line_end].splitlines():
+            for pattern, key in _INTERWINNER_ACQ_PATTERNS:
+                match = pattern.search(line)
+                if match:
+                    value = match.group(1).strip()
+                    
+                    if 'date' in key:
+                        try:
+                            parsed_date = dt.strptime(value, '%d.%m.%Y %H:%M:%S')
+                            parsed_date = dt.strftime(parsed_date, "%Y-%m-%d %H:%M:%S")
+                            setattr(self, key, parsed_date)
+                        except ValueError as e:
+                            print(f"Error parsing date '{value}': {e}")
+                    
+                    elif '_time' in key:
+                        setattr(self, key, float(value))
+                    
+                    elif 'detector' in key:
+                        setattr(self, key, value.replace(' ', '_'))
         
-        # Header pattern to check is there is NET only or NET-NUL
-        header_pattern = r'\|No\.\|\s+Energy\s+\|[\s+]?FWHM\s+\|[\s+]?FWTM\s+\|\s+GROSS\s+\|\s+NET\s+\|\s+NETTO-NUL\s+\|UNCERT\[\%\]\|\s+EFF\.\[\%\]\s+\|\s+ISOTOPE\s+\|.*$'
+        # Peak data, scanned at once over the table between the line of the candidate
+        # isotopes list and the line of the confirmed isotopes list
+        start = report.find(_INTERWINNER_TABLE_START, 0, end_line_start)
+        peaks = []
+        if start >= 0:
+            table_start = report.find('\n', start) + 1
+            if table_start == 0:
+                table_start = len(report)
+            peaks = [match.groups() for match in pattern_data.finditer(report, table_start, end_line_start)]
         
-        # Load report file in binary mode (should be faster)
-        with open(self.filepath, 'r', encoding='utf-8', errors='ignore') as file:
-            report = file.read()
-            has_netto_null = re.search(header_pattern, report, re.MULTILINE | re.DOTALL) is not None
-            pattern_data = pattern_data_1 if has_netto_null else pattern_data_2
-            
-            for line in report.splitlines():
-                for pattern, key in zip(acq_data_patterns, keys_data_patterns):
-                    match = re.search(pattern, line)
-                    if match:
-                        value = match.group(1).strip()
-                        
-                        if 'date' in key:
-                            try:
-                                parsed_date = dt.strptime(value, '%d.%m.%Y %H:%M:%S')
-                                parsed_date = dt.strftime(parsed_date, "%Y-%m-%d %H:%M:%S")
-                                setattr(self, key, parsed_date)
-                            except ValueError as e:
-                                print(f"Error parsing date '{value}': {e}")
-                        
-                        elif '_time' in key:
-                            setattr(self, key, float(value))
-                        
-                        elif 'detector' in key:
-                            setattr(self, key, value.replace(' ', '_'))
-
-                if 'List by energies (with candidate isotopes)' in line:
-                    start_collecting = True
-                    continue
-                elif 'List by energies (with confirmed isotopes)' in line:
-                    break
-                
-                if start_collecting:
-                    match = re.search(pattern_data, line)
-                    
-                    if match:
-                        energy, net, uncert = match.groups()
-                        self.energy.append(float(energy))
-                        self.net_counts.append(float(net))
-                        # uncert is in % if you load data from InterWinner report
-                        self.err_net_counts.append(float(net) * float(uncert) / 100 )
-            
-            # Convert to numpy
-            self.energy = np.array(self.energy)
-            self.net_counts = np.array(self.net_counts)
-            self.err_net_counts = np.array(self.err_net_counts)
+        # Convert the matched (energy, net, uncert) strings to numpy in one go
+        data = np.array(peaks, dtype=np.float64).reshape(-1, 3)
+        self.energy = data[:, 0].copy()
+        self.net_counts = data[:, 1].copy()
+        # uncert is in % if you load data from InterWinner report
+        self.err_net_counts = data[:, 1] * data[:, 2] / 100
     
     def get_report_Genie2K(self):
         '''
@@ -352,73 +433,39 @@ class Report:
         None.
 
         '''
-        # Data patterns to match
-        acq_data_patterns = [r'Sample ID\s+:\s(\S+)\s+$',
-                             r'Detector level\s+:\s(.+?\scm)\s+$',
-                             r'Detector\s+:\s(.*?)\s*$',
-                             r'Acquisition Time\s+:\s+(\d{2}\.\d{2}\.\d{4} \d{2}:\d{2}:\d{2})\s*$',
-                             r'Live Time\s+:\s+([\d.]+)\sseconds$',
-                             r'Real Time\s+:\s+([\d.]+)\sseconds$']
-        
-        keys_data_patterns = ['tar_id',
-                              'detector_level',
-                              'detector',
-                              'datetime_meas',
-                              'live_time',
-                              'real_time']
+        report = _read_report(self.filepath)
         
-        header_data = r'\s*Peak\s+ROI\s+ROI\s+Peak\s+Energy\s+FWHM\s+Net Peak\s+Net Area\s+Continuum\s*$'
-        
-        with open(self.filepath, 'r', encoding='utf-8', errors='ignore') as file:
-            report = file.read()
-            
-            for pattern, key in zip(acq_data_patterns,keys_data_patterns):
-                match = re.findall(pattern,report, re.MULTILINE)
-                if match:
-                    value = match[0]
-                    if key == 'datetime_meas':
-                        try:
-                            parsed_date = dt.strptime(value, '%d.%m.%Y %H:%M:%S')
-                            parsed_date = dt.strftime(parsed_date, "%Y-%m-%d %H:%M:%S")
-                            setattr(self, key, parsed_date)
-                        except ValueError as e:
-                            print(f"Error parsing date '{value}': {e}")
-                    elif '_time' in key:
-                        setattr(self, key, float(value))
-                    elif key == 'detector':
-                        self.detector = value
-                    elif key == 'tar_id':
-                        setattr(self, key, value.lower())
-                    else:
-                        setattr(self, key, value)
+        for pattern, key in _GENIE2K_ACQ_PATTERNS:
+            match = pattern.findall(report)
+            if match:
+                value = match[0]
+                if key == 'datetime_meas':
+                    try:
+                        parsed_date = dt.strptime(value, '%d.%m.%Y %H:%M:%S')
+                        parsed_date = dt.strftime(parsed_date, "%Y-%m-%d %H:%M:%S")
+                        setattr(self, key, parsed_date)
+                    except ValueError as e:
+                        print(f"Error parsing date '{value}': {e}")
+                elif '_time' in key:
+                    setattr(self, key, float(value))
+                elif key == 'detector':
+                    self.detector = value
+                elif key == 'tar_id':
+                    setattr(self, key, value.lower())
                 else:
-                    raise ValueError(f"Value for '{key}' not found.")
-            
-            # Store the data for each detected peak
-            pattern_data = r'\s*[mM]?\s*\d+\s+\d+-\s*\d+\s+[\d.]+\s+([\d.]+)\s+[\d.]+\s+([\d.E+]+)\s+([\d.]+)\s+[\d.E+]+\s*$'
-            
-            # Check when to start collecting
-            start_collecting = False
-            
-            for line in report.splitlines():
-                
-                if re.search(header_data, line):
-                    start_collecting = True
-                    continue
-                
-                if start_collecting:
-                    match = re.search(pattern_data, line)
-                    
-                    if match:
-                        energy, net, uncert = match.groups()
-                        self.energy.append(float(energy))
-                        self.net_counts.append(float(net))
-                        self.err_net_counts.append(float(uncert))
-
-        # Convert to numpy for consistency with InterWinner parser.
-        self.energy = np.array(self.energy)
-        self.net_counts = np.array(self.net_counts)
-        self.err_net_counts = np.array(self.err_net_counts)
+                    setattr(self, key, value)
+            else:
+                raise ValueError(f"Value for '{key}' not found.")
+        
+        # Peak data, scanned at once over the report after the first header of the peak table
+        header = _GENIE2K_HEADER_RE.search(report)
+        peaks = [match.groups() for match in _GENIE2K_DATA_RE.finditer(report, header.end())] if header else []
+
+        # Convert the matched (energy, net, uncert) strings to numpy in one go, for consistency with InterWinner parser.
+        data = np.array(peaks, dtype=np.float64).reshape(-1, 3)
+        self.energy = data[:, 0].copy()
+        self.net_counts = data[:, 1].copy()
+        self.err_net_counts = data[:, 2].copy()
                         
     def __str__(self):
         return f"Report of '{self.filepath}'."
@@ -1,10 +1,10 @@
 #%% Relevant packages
 
 import numpy as np
-import pandas as pd
-from os import listdir
-from os.path import isfile, join
+from os import scandir
 import subprocess
+from datetime import datetime
+from typing import Union
 
 #%% Custom packages
 
@@ -13,9 +13,57 @@ from .measurement import Measurement, MeasurementList, get_datetime_meas
 from .spectrometry import Report
 from .proton_beam import ProtonBeam
 from .activity_evaluation import evaluate_eob_activity
-from .core.utils import time_difference, load_config
+from .core.utils import time_difference, load_config, load_workbook, cached_by_mtime, IndexedList
 
-config = load_config()
+#%% List and read the report files
+
+def _list_files(directory):
+    ''' File paths in a directory (scandir reuses the file type from the directory listing) '''
+    with scandir(directory) as it:
+        return [entry.path for entry in it if entry.is_file()]
+
+def _list_reports(dir_reports):
+    ''' File paths of the gamma measurement reports, mapping the Genie drive if the directory is not found '''
+    try:
+        return _list_files(dir_reports)
+    except FileNotFoundError as error:
+        print(f"Error: {error}")
+        print("Attempting to map the Genie drive...")
+    
+        try:
+            # Map the network drive
+            subprocess.run(['net', 'use', 'T:', r'\\fs02\Genie2kLCH'], check=True, shell=True)
+            print("Drive T: mapped successfully. Retrying file loading...")
+            
+            # Retry loading file paths after mapping the drive
+            return _list_files(dir_reports)
+        except subprocess.CalledProcessError as e:
+            print(f"Failed to map drive: {e}")
+            return []  # Default to an empty list if drive mapping fails
+
+def _read_reports(report_list, software):
+    ''' Parse the report files with the reader of the analysis software '''
+    if software not in ('InterWinner', 'Genie2K'):
+        raise ValueError(f"{software} is not 'Genie2K' or 'InterWinner'.")
+    
+    reports = []
+    for filepath in report_list:
+        report = Report(filepath)
+        if software == 'InterWinner':
+            report.get_report_InterWinner()
+        else:
+            report.get_report_Genie2K()
+        reports.append(report)
+    
+    return reports
+
+#%% Molecular weights and densities indexed by material
+
+@cached_by_mtime
+def _material_properties(filepath):
+    ''' MolecularWeights sheet indexed by material (first occurrence kept, built once per workbook version) '''
+    df = load_workbook(filepath)['MolecularWeights'].set_index('material')
+    return df[~df.index.duplicated(keep='first')]
 
 #%% Target class
 
@@ -24,8 +72,8 @@ class Target:
     
     def __init__(
         self,
-        irr_start: str,
-        irr_end: str,
+        irr_start: Union[str, datetime],
+        irr_end: Union[str, datetime],
         mass: float,
         tar_id: str,
         tar_mat: str,
@@ -37,9 +85,9 @@ class Target:
 
         Parameters
         ----------
-        irr_start : str
+        irr_start : str or datetime
             Date and time of irradiation start.
-        irr_end : str
+        irr_end : str or datetime
             Date and time of irradiation end.
         mass : float
             Target mass.
@@ -69,8 +117,8 @@ class Target:
 
         '''
 
-        self.irr_start: str = irr_start
-        self.irr_end: str = irr_end
+        self.irr_start: Union[str, datetime] = irr_start
+        self.irr_end: Union[str, datetime] = irr_end
         self.mass: float = mass
         self.target_id: str = tar_id
         self.target_material: str = tar_mat
@@ -85,29 +133,32 @@ class Target:
         self.energy = proton_beam.energy
         self.actual_current = current / 50 * proton_beam.current
         
-        # Check file existence before proceeding
+        config = load_config()
+        
+        # Check file existence before proceeding (workbooks are parsed only once)
         try:
-            df = pd.read_excel(config['GL_FILEPATH'], sheet_name="NuclideData", usecols="A:E")
+            df = load_workbook(config['GL_FILEPATH'])["NuclideData"].iloc[:, :5]
         except FileNotFoundError:
             raise FileNotFoundError(f"File {config['GL_FILEPATH']} not found.")
         except Exception as e:
             raise Exception(f"Error reading the Excel file: {str(e)}")
             
         # Load radionuclides present in a specific target material
-        df_nuc_inventory = pd.read_excel(config['MATERIALS_DATA'], sheet_name='Material_NuclideInventory')
-        df_mol_weights = pd.read_excel(config['MATERIALS_DATA'], sheet_name='MolecularWeights')
+        materials = load_workbook(config['MATERIALS_DATA'])
+        df_nuc_inventory = materials['Material_NuclideInventory']
         if tar_mat not in df_nuc_inventory.columns:
             raise ValueError(f"Target material '{tar_mat}' not found in Material_NuclideInventory sheet.")
         
-        # Define molecular weight of target material
-        mat_row = df_mol_weights[df_mol_weights['material'] == self.target_material]
-        if mat_row.empty:
+        # Define molecular weight and density of target material
+        df_mol_weights = _material_properties(config['MATERIALS_DATA'])
+        if self.target_material not in df_mol_weights.index:
             raise ValueError(f"Target material '{self.target_material}' not found in MolecularWeights sheet.")
-        self.mol_weight = mat_row['mol_weight'].iloc[0]
-        
-        # Define target material density
-        self.density = mat_row['density'].iloc[0]
+        self.mol_weight = df_mol_weights.at[self.target_material, 'mol_weight']
+        self.density = df_mol_weights.at[self.target_material, 'density']
 
+        # Keep only the radionuclides produced in the target material (hashed, vectorized filter)
+        df = df[df.nuclide.isin(df_nuc_inventory[tar_mat].dropna())]
+        
         # Initialize radionuclide list
         self.radionuclides = RadionuclideList(
             [Radionuclide(
@@ -115,21 +166,25 @@ class Target:
                 hf,
                 err_hf,
                 uom,
-                Ey_s) for nuc, hf, err_hf, uom, Ey_s in zip(
-                        df.nuclide,
-                        df.half_life,
-                        df.err_half_life,
-                        df.uom,
-                        df.selected_g_line) if nuc in df_nuc_inventory[tar_mat].dropna().to_list()
+                Ey_s) for nuc, hf, err_hf, uom, Ey_s in df[[
+                    'nuclide',
+                    'half_life',
+                    'err_half_life',
+                    'uom',
+                    'selected_g_line']].itertuples(index=False)
                 ]
             )
         
-        # Load the gamma lines of each radionuclide
+        # Load the gamma lines of each radionuclide from the sheets parsed in a single read
+        # (copies, since the cached sheets are shared)
+        gamma_lines_sheets = load_workbook(config['GL_FILEPATH'])
         for nuc in self.radionuclides:
-            gamma_lines = pd.read_excel(config['GL_FILEPATH'], sheet_name=nuc.name)
-            self.radionuclides[nuc].g_energies = gamma_lines.energy.to_numpy()
-            self.radionuclides[nuc].intensities = gamma_lines.intensity.to_numpy()
-            self.radionuclides[nuc].err_intensities = gamma_lines.err_intensity.to_numpy()
+            gamma_lines = gamma_lines_sheets[nuc.name]
+            nuc.set_gamma_lines(
+                gamma_lines.energy.to_numpy(dtype=np.float64, copy=True),
+                gamma_lines.intensity.to_numpy(dtype=np.float64, copy=True),
+                gamma_lines.err_intensity.to_numpy(dtype=np.float64, copy=True)
+                )
          
         # **** Initialize useful attributes ****
         # Cooling time
@@ -141,35 +196,26 @@ class Target:
     
     def load_measurements(self, dir_reports, software):
         
-        # Load file paths of gamma measurement reports
-        try:
-            report_list = [join(dir_reports, f) for f in listdir(dir_reports) if isfile(join(dir_reports, f))]
-        except FileNotFoundError as error:
-            print(f"Error: {error}")
-            print("Attempting to map the Genie drive...")
-        
-            try:
-                # Map the network drive
-                subprocess.run(['net', 'use', 'T:', r'\\fs02\Genie2kLCH'], check=True, shell=True)
-                print("Drive T: mapped successfully. Retrying file loading...")
-                
-                # Retry loading file paths after mapping the drive
-                report_list = [join(dir_reports, f) for f in listdir(dir_reports) if isfile(join(dir_reports, f))]
-            except subprocess.CalledProcessError as e:
-                print(f"Failed to map drive: {e}")
-                report_list = []  # Default to an empty list if drive mapping fails
+        # Load and parse the gamma measurement reports
+        reports = _read_reports(_list_reports(dir_reports), software)
+        self.add_measurements(reports)
+    
+    def add_measurements(self, reports):
+        '''
+        Add the gamma measurements of the reports belonging to this target
+
+        Parameters
+        ----------
+        reports : list of Report
+            Parsed reports, those of other targets are ignored.
+
+        Returns
+        -------
+        None.
+
+        '''
         
-        for filepath in report_list:
-            
-            # Read report file
-            report = Report(filepath)
-            if software == 'InterWinner':
-                report.get_report_InterWinner()
-            elif software == 'Genie2K':
-                report.get_report_Genie2K()
-            else:
-                raise ValueError(f"{software} is not 'Genie2K' or 'InterWinner'.")
-            
+        for report in reports:
             if str(self.target_id).lower() == str(report.tar_id).lower():
                 self.measurements.append(
                     Measurement(
@@ -203,52 +249,49 @@ class Target:
 
         '''
         
-        # Reset previously computed values to make repeated calls deterministic.
-        for r in self.radionuclides:
-            self.radionuclides[r].act_eob = []
-            self.radionuclides[r].err_act_eob = []
+        # Collect the EoB activities of the main gamma line in temporary lists,
+        # rebuilt on every call to make repeated calls deterministic.
+        act_eob = {r.name: [] for r in self.radionuclides}
+        err_act_eob = {r.name: [] for r in self.radionuclides}
 
         # Store only valid EoB activity results in the radionuclide list of Target class
         for m in self.measurements:
             for r in m.radionuclides:
-                if r.g_energies is None or len(r.g_energies) == 0:
+                if r.g_line_idx is None:
                     continue
 
-                idx = int(np.argmin(np.abs(np.asarray(r.g_energies) - r.g_line)))
-                self.radionuclides[r].act_eob.append(float(r.act_eob[idx]))
-                self.radionuclides[r].err_act_eob.append(float(r.err_act_eob[idx]))
-        
-        for r in self.radionuclides:
-            self.radionuclides[r].act_eob = np.array(self.radionuclides[r].act_eob)
-            self.radionuclides[r].err_act_eob = np.array(self.radionuclides[r].err_act_eob)
+                act_eob[r.name].append(r.act_eob[r.g_line_idx])
+                err_act_eob[r.name].append(r.err_act_eob[r.g_line_idx])
         
-        # Now the target.radionuclides[i].act_eob is a list of non-zero act_eob
-        for r in self.radionuclides:
-            if r.act_eob.size == 0:
+        # Convert to arrays and compute the mean EoB activity in a single pass
+        for rad in self.radionuclides:
+            act = np.asarray(act_eob[rad.name], dtype=np.float64)
+            err_act = np.asarray(err_act_eob[rad.name], dtype=np.float64)
+            rad.act_eob = act
+            rad.err_act_eob = err_act
+            
+            if act.size == 0:
                 # The mean_act_eob is already initialized to 0
                 continue
-            elif r.act_eob.size == 1:
+            elif act.size == 1:
                 # Only 1 result, no reason to perform weighed mean
-                self.radionuclides[r].mean_act_eob = r.act_eob[0]
-                self.radionuclides[r].err_mean_act_eob = r.err_act_eob[0]
+                rad.mean_act_eob = act[0]
+                rad.err_mean_act_eob = err_act[0]
             else:
                 # Calculate the weights = inverse of error squared
-                valid = r.err_act_eob > 0
+                valid = err_act > 0
                 if not np.any(valid):
                     # fallback to simple mean when all errors are null/invalid
-                    self.radionuclides[r].mean_act_eob = float(np.mean(r.act_eob))
-                    self.radionuclides[r].err_mean_act_eob = 0.0
+                    rad.mean_act_eob = float(np.mean(act))
+                    rad.err_mean_act_eob = 0.0
                     continue
-                weights = 1 / r.err_act_eob[valid] ** 2
+                weights = 1 / np.square(err_act[valid])
                 
                 # Perform weighted average of the EoB activities
-                self.radionuclides[r].mean_act_eob = np.average(
-                    r.act_eob[valid],
-                    weights=weights
-                    )
+                rad.mean_act_eob = np.dot(act[valid], weights) / weights.sum()
                 
                 # Calculate the error
-                self.radionuclides[r].err_mean_act_eob = np.sqrt(1/weights.sum())
+                rad.err_mean_act_eob = np.sqrt(1/weights.sum())
     
     def calculate_tty(self):
         '''
@@ -265,9 +308,9 @@ class Target:
         if corr_factor == 0:
             raise ValueError("Cannot calculate thin-target yield with zero proton current.")
         
-        for i, nuclide in enumerate(self.radionuclides):
-            self.radionuclides[i].thin_target_yield = nuclide.mean_act_eob / (corr_factor * proton_beam.current)
-            self.radionuclides[i].err_thin_target_yield = nuclide.err_mean_act_eob / (corr_factor * proton_beam.current)
+        for nuclide in self.radionuclides:
+            nuclide.thin_target_yield = nuclide.mean_act_eob / (corr_factor * proton_beam.current)
+            nuclide.err_thin_target_yield = nuclide.err_mean_act_eob / (corr_factor * proton_beam.current)
                 
     def __str__(self):
         return f"Target: {self.target_id} -> {self.target_material} ({self.degrader})."
@@ -282,14 +325,17 @@ class Target:
             return tar_id_to_test == self.target_id
         return NotImplemented
 
-class TargetList(list):
+class TargetList(IndexedList):
+    # Targets are looked up by ID
+    _key_attr = 'target_id'
+    
     def __init__(self, list_):
         # Check whether the input is a list
         if not isinstance(list_, list):
-            raise ValueError(f"Input {list_} is not a list.")
+            raise TypeError(f"Input {list_} is not a list.")
         invalid_item = next((i for i in list_ if not isinstance(i, Target)), None)
         if invalid_item is not None:
-            raise ValueError(f"Item {invalid_item} is not of Target type.")
+            raise TypeError(f"Item {invalid_item} is not of Target type.")
         super().__init__(list_)
             
     def get_acquisition_data(self, dir_reports: str, software: str):
@@ -309,28 +355,37 @@ class TargetList(list):
 
         '''
         
+        # List the directory (mapping the drive if needed) and parse each report only once
+        reports = _read_reports(_list_reports(dir_reports), software)
+        
+        # Hand each report to the targets with the same ID
+        reports_by_id = {}
+        for report in reports:
+            reports_by_id.setdefault(str(report.tar_id).lower(), []).append(report)
+        
+        # Initialize gamma measurement objects and net counts
         for target in self:
-            # Initialize gamma measurement objects and net counts
-            target.load_measurements(dir_reports, software)
-            
-            for i, _ in enumerate(target.measurements):
-                target.measurements[i].calculate_cooling_time(target.irr_end)
+            target.add_measurements(reports_by_id.get(str(target.target_id).lower(), []))
+        
+        for target in self:
+            for m in target.measurements:
+                m.calculate_cooling_time(target.irr_end)
     
     def calculate_activities(self):
         ''' Calculate measured activity and EoB activity '''
         for t in self:
-            for i, m in enumerate(t.measurements):
+            for m in t.measurements:
+                # Calculate activity at the beginning of acquisition
+                m.radionuclides.calculate_activities(
+                    m.level,
+                    m.detector,
+                    m.real_time,
+                    m.live_time
+                    )
+                
                 for r in m.radionuclides:
-                    # Calculate activity at the beginning of acquisition
-                    t.measurements[i].radionuclides[r].calculate_activity(
-                        m.level,
-                        m.detector,
-                        m.real_time,
-                        m.live_time
-                        )
-                    
                     # Calculate EoB activity
-                    t.measurements[i].radionuclides[r].calculate_eob_act(m.t_cool)
+                    r.calculate_eob_act(m.t_cool)
     
     def calculate_mean_activities(self):
         ''' Evaluate mean activities for each target and radionuclide '''
@@ -342,7 +397,7 @@ class TargetList(list):
         
         for t in self:
             for r in t.radionuclides:
-                t.radionuclides[r].act_eob_eval = evaluate_eob_activity(
+                r.act_eob_eval = evaluate_eob_activity(
                     r.name,
                     t.energy,
                     t.t_irr,
@@ -366,15 +421,29 @@ class TargetList(list):
         if isinstance(item, Target):
             super().append(item)
         else:
-            raise ValueError(f'{item} is not of Target type.')
+            raise TypeError(f'{item} is not of Target type.')
+    
+    def insert(self, index, item):
+        if isinstance(item, Target):
+            super().insert(index, item)
+        else:
+            raise TypeError(f"The {item} to add is not of Target type.")
+    
+    def extend(self, other):
+        # Materialize iterators, which would be consumed by the type check
+        other = list(other)
+        for item in other:
+            if not isinstance(item, Target):
+                raise TypeError(f"The item {item} to extend is not a Target.")
+        
+        super().extend(other)
     
     def __getitem__(self, key):
-        # In case I have a string
-        if isinstance(key, str) or isinstance(key, Target):
-            for item in self:
-                if item == key:
-                    return item
-                
-            raise KeyError(f"No target found with ID {key}")
+        # In case I have a string or a target
+        if isinstance(key, (str, Target)):
+            try:
+                return self._lookup(key if isinstance(key, str) else key.target_id)
+            except KeyError:
+                raise KeyError(f"No target found with ID {key}") from None
         # In case key not string but, e.g., a number -> classic indexing of list
         return super().__getitem__(key)